@@ -24,8 +24,8 @@ echo "Installing dependencies..."
 source service/venv/bin/activate
 pip install --upgrade pip
 
-# Install LLM Guard and FastAPI
-pip install "llm-guard>=0.3.15" fastapi uvicorn requests "transformers>=4.40,<5.0"
+# Install LLM Guard, FastAPI and the scanner dependencies
+pip install -r service/requirements.txt
 
 echo ""
 echo "=== Installation Complete ==="
@@ -1,11 +1,14 @@
 """LLM Guard configuration - customize for your organization"""
+import functools
+
 from llm_guard.input_scanners import (
-    PromptInjection, Secrets, Code, InvisibleText,
-    Toxicity, BanSubstrings, Regex
+    Secrets, Code, InvisibleText
 )
 from llm_guard.output_scanners import (
-    Sensitive, MaliciousURLs, NoRefusal, Regex as OutputRegex
+    Sensitive, MaliciousURLs, NoRefusal
 )
+from hs_scanner import ACBanSubstrings, HyperscanRegex, PrefilteredPromptInjection
+from ort_scanner import ORTPromptInjection, ORTToxicity
 
 # API key patterns to detect and redact
 # Add patterns specific to your tools and services
@@ -30,28 +33,55 @@ COMPANY_SENSITIVE_TERMS = [
     # "partner-company",
 ]
 
+# Lower-cased once at import; the term scanner matches case-insensitively and
+# should not re-lower the configured terms on every rebuild
+_SENSITIVE_TERMS_LC = tuple(term.lower() for term in COMPANY_SENSITIVE_TERMS)
+
+# Phrases that show up in virtually all prompt-injection attempts. Short
+# content containing none of these skips the injection model entirely;
+# anything suspicious (or long) still gets the full transformer pass.
+INJECTION_LITERALS = [
+    "ignore all previous",
+    "ignore previous instructions",
+    "disregard the above",
+    "disregard all previous",
+    "forget your instructions",
+    "system prompt",
+    "debug mode",
+    "developer mode",
+    "you are now",
+    "new instructions",
+    "do anything now",
+    "jailbreak",
+]
+
+# Both factories are memoized: scanner construction compiles regex databases
+# and loads transformer weights, so repeated calls (tests, --reload, preload)
+# must reuse the instances built on first call.
+@functools.lru_cache(maxsize=1)
 def create_input_scanners():
     """Create input scanners for external content"""
     scanners = [
-        PromptInjection(threshold=0.8),
+        PrefilteredPromptInjection(ORTPromptInjection(threshold=0.8), INJECTION_LITERALS),
         Secrets(redact_mode=True),
         Code(languages=["Python", "JavaScript", "Go", "PowerShell"]),
         InvisibleText(),
-        Toxicity(threshold=0.7),
-        Regex(patterns=BUSINESS_API_PATTERNS, redact=True, is_blocked=True)
+        ORTToxicity(threshold=0.7),
+        HyperscanRegex(BUSINESS_API_PATTERNS)
     ]
 
     # Only add BanSubstrings if terms are configured
     if COMPANY_SENSITIVE_TERMS:
-        scanners.append(BanSubstrings(substrings=COMPANY_SENSITIVE_TERMS, redact=True))
+        scanners.append(ACBanSubstrings(_SENSITIVE_TERMS_LC))
 
     return scanners
 
+@functools.lru_cache(maxsize=1)
 def create_output_scanners():
     """Create output scanners for AI responses"""
     return [
         Sensitive(entity_types=["EMAIL", "PHONE_NUMBER", "CREDIT_CARD"]),
         MaliciousURLs(),
         NoRefusal(),
-        OutputRegex(patterns=BUSINESS_API_PATTERNS, redact=True, is_blocked=True)
+        HyperscanRegex(BUSINESS_API_PATTERNS)
     ]
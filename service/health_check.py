@@ -2,14 +2,19 @@
 """Health check utility for LLM Guard service"""
 import sys
 import requests
+from requests.adapters import HTTPAdapter
 from datetime import datetime
 
 SERVICE_URL = "http://127.0.0.1:8765"
 
+# Keep-alive session so repeated checks reuse one TCP connection
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=8, pool_maxsize=16))
+
 def check_health():
     """Check if the LLM Guard service is healthy"""
     try:
-        response = requests.get(f"{SERVICE_URL}/health", timeout=5)
+        response = SESSION.get(f"{SERVICE_URL}/health", timeout=5)
         if response.status_code == 200:
             data = response.json()
             print(f"Status: {data['status']}")
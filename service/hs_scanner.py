@@ -0,0 +1,283 @@
+"""Hyperscan-backed regex scanner - single-pass replacement for llm_guard's Regex
+
+Compiles every pattern into one block-mode Hyperscan database at construction
+time, so each scan is a single SIMD pass over the content instead of one
+Python `re` traversal per pattern.
+"""
+import logging
+import re
+
+import ahocorasick
+
+# Hyperscan ships binary wheels for a limited set of platforms; fall back to
+# re2 (linear-time DFA, one combined alternation) and finally stdlib re
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+logger = logging.getLogger(__name__)
+
+REDACT_TOKEN = "[REDACTED]"
+
+# Longest repeat any pattern may match; real API keys are far shorter
+MAX_REPEAT = 512
+
+_OPEN_REPEAT = re.compile(r"\{(\d+),\}")
+
+_REGEX_META = set("\\^$.|?*+()[]{")
+
+
+def bound_pattern(pattern):
+    """Cap unbounded quantifiers (+, *, {n,}) at MAX_REPEAT repeats
+
+    Open-ended quantifiers are a ReDoS vector under a backtracking engine:
+    crafted input ending in non-matching bytes can trigger quadratic
+    re-walks. Bounding the repeat count caps worst-case cost at
+    O(len x MAX_REPEAT) even on the stdlib-re fallback path.
+
+    The pattern is walked character by character so escapes pass through
+    untouched and +/* inside a character class (e.g. base64 alphabets like
+    [A-Za-z0-9+/]) stay literal.
+    """
+    out = []
+    i = 0
+    in_class = False
+    while i < len(pattern):
+        ch = pattern[i]
+        if ch == "\\" and i + 1 < len(pattern):
+            out.append(pattern[i:i + 2])
+            i += 2
+            continue
+        if in_class:
+            if ch == "]":
+                in_class = False
+            out.append(ch)
+            i += 1
+            continue
+        if ch == "[":
+            in_class = True
+        elif ch == "+":
+            ch = "{1,%d}" % MAX_REPEAT
+        elif ch == "*":
+            ch = "{0,%d}" % MAX_REPEAT
+        elif ch == "{":
+            open_repeat = _OPEN_REPEAT.match(pattern, i)
+            if open_repeat:
+                out.append("{%s,%d}" % (open_repeat.group(1), MAX_REPEAT))
+                i = open_repeat.end()
+                continue
+        out.append(ch)
+        i += 1
+    return "".join(out)
+
+
+def _literal_prefix(pattern):
+    """Leading literal characters of a pattern, up to the first metacharacter"""
+    prefix = []
+    for ch in pattern:
+        if ch in _REGEX_META:
+            break
+        prefix.append(ch)
+    return "".join(prefix)
+
+
+def _fold_preserving_length(content):
+    """Lowercase content without changing its length
+
+    str.lower() can expand some characters (e.g. U+0130 lowers to two code
+    points), which would shift every subsequent match offset relative to
+    the original string. Characters whose lowercase form is longer are left
+    as-is so spans found on the folded copy line up with the original.
+    """
+    lowered = content.lower()
+    if len(lowered) == len(content):
+        return lowered
+    return "".join(
+        ch.lower() if len(ch.lower()) == 1 else ch for ch in content
+    )
+
+
+def _merge_spans(spans):
+    """Merge overlapping (start, end) byte spans into a sorted, disjoint list"""
+    merged = []
+    for start, end in sorted(spans):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _redact_spans(content, spans):
+    """Splice REDACT_TOKEN over merged spans in one linear pass
+
+    Accepts str with character spans or bytes with byte spans; returns str
+    either way. One walk plus one join keeps redaction linear in content
+    length no matter how many hits there are, unlike repeated str.replace
+    which rebuilds the whole string per match.
+    """
+    is_bytes = isinstance(content, bytes)
+    token = REDACT_TOKEN.encode() if is_bytes else REDACT_TOKEN
+    out = []
+    prev = 0
+    for start, end in _merge_spans(spans):
+        out.append(content[prev:start])
+        out.append(token)
+        prev = end
+    out.append(content[prev:])
+    if is_bytes:
+        return b"".join(out).decode("utf-8", errors="replace")
+    return "".join(out)
+
+
+class HyperscanRegex:
+    """Drop-in replacement for the Regex/OutputRegex scanners
+
+    Works as both an input scanner (scan(prompt)) and an output scanner
+    (scan(prompt, output)); matches are treated as blocked, like
+    Regex(..., is_blocked=True). Without hyperscan installed, all patterns
+    are merged into one alternation compiled by re2 (or stdlib re as a last
+    resort) - still a single pass per scan rather than one per pattern.
+    """
+
+    # Reported in threats_detected under the original scanner name
+    name = "Regex"
+
+    def __init__(self, patterns, redact=True):
+        self._patterns = []
+        for pattern in patterns:
+            bounded = bound_pattern(pattern)
+            if bounded != pattern:
+                logger.warning(
+                    "Pattern %r has an unbounded quantifier; bounded to %r",
+                    pattern, bounded,
+                )
+            self._patterns.append(bounded)
+        self._redact = redact
+        self._db = None
+        self._alternation = None
+
+        # Every API-key pattern starts with a fixed literal (lin_api_, sk-,
+        # xoxb-, ...). If each pattern has one and none occur in the content,
+        # the regex engine never needs to run. Disabled if any pattern lacks
+        # a literal prefix, since then nothing can be ruled out cheaply.
+        prefixes = tuple(_literal_prefix(p) for p in self._patterns)
+        self._prefixes = prefixes if all(prefixes) else ()
+        if hyperscan is not None:
+            self._db = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+            self._db.compile(
+                expressions=[p.encode() for p in self._patterns],
+                ids=list(range(len(self._patterns))),
+                flags=[hyperscan.HS_FLAG_SOM_LEFTMOST] * len(self._patterns),
+            )
+        else:
+            combined = "|".join(f"(?:{p})" for p in self._patterns)
+            engine = re2 if re2 is not None else re
+            self._alternation = engine.compile(combined)
+
+    def _find_spans(self, content, data):
+        if self._db is not None:
+            spans = []
+
+            def on_match(pattern_id, start, end, flags, context):
+                spans.append((start, end))
+
+            self._db.scan(data, match_event_handler=on_match)
+            return spans
+
+        # Fallback engines work on str; translate char spans to byte spans
+        # only when the content is non-ASCII
+        if content.isascii():
+            return [m.span() for m in self._alternation.finditer(content)]
+        return [
+            (len(content[:m.start()].encode()), len(content[:m.end()].encode()))
+            for m in self._alternation.finditer(content)
+        ]
+
+    def scan(self, prompt, output=None):
+        # Output scanners receive (prompt, output); scan whichever is the payload
+        content = output if output is not None else prompt
+
+        # C-level substring checks rule out most clean content before any
+        # regex engine is involved
+        if self._prefixes and not any(p in content for p in self._prefixes):
+            return content, True, 0.0
+
+        data = content.encode()
+        spans = self._find_spans(content, data)
+        if not spans:
+            return content, True, 0.0
+
+        sanitized = _redact_spans(data, spans) if self._redact else content
+        return sanitized, False, 1.0
+
+
+class PrefilteredPromptInjection:
+    """Literal prefilter in front of the prompt-injection model
+
+    Short prompts with none of the known injection phrasings are passed
+    through after a single Aho-Corasick sweep, skipping the transformer
+    entirely; anything longer or containing a suspicious literal is handed
+    to the wrapped scanner.
+    """
+
+    # Reported in threats_detected under the original scanner name
+    name = "PromptInjection"
+
+    # Prompts at or above this length always go to the model
+    MAX_SKIP_LENGTH = 512
+
+    def __init__(self, scanner, literals):
+        self._scanner = scanner
+        self._ac = ahocorasick.Automaton()
+        for i, literal in enumerate(literals):
+            self._ac.add_word(literal.lower(), i)
+        self._ac.make_automaton()
+
+    def scan(self, prompt):
+        if len(prompt) < self.MAX_SKIP_LENGTH:
+            if next(self._ac.iter(prompt.lower()), None) is None:
+                return prompt, True, 0.0
+        return self._scanner.scan(prompt)
+
+
+class ACBanSubstrings:
+    """Drop-in replacement for BanSubstrings using an Aho-Corasick automaton
+
+    Builds the automaton once at construction, so each scan is a single
+    case-insensitive pass over the content instead of one search per term.
+    The content is lower-cased exactly once per scan, and only when some
+    term actually needs case folding.
+    """
+
+    # Reported in threats_detected under the original scanner name
+    name = "BanSubstrings"
+
+    def __init__(self, substrings, redact=True):
+        self._redact = redact
+        terms_lc = [term.lower() for term in substrings]
+        # Skip the per-request lower() allocation when no term carries letters
+        self._needs_folding = any(t != t.upper() for t in terms_lc)
+        self._ac = ahocorasick.Automaton()
+        for i, term in enumerate(terms_lc):
+            self._ac.add_word(term, (i, term))
+        self._ac.make_automaton()
+
+    def scan(self, prompt):
+        lowered = _fold_preserving_length(prompt) if self._needs_folding else prompt
+        spans = [
+            (end + 1 - len(term), end + 1)
+            for end, (_, term) in self._ac.iter(lowered)
+        ]
+
+        if not spans:
+            return prompt, True, 0.0
+
+        sanitized = _redact_spans(prompt, spans) if self._redact else prompt
+        return sanitized, False, 1.0
@@ -0,0 +1,241 @@
+"""int8 ONNX Runtime classifiers - quantized replacements for the FP32 model scanners
+
+Exports the HuggingFace models behind llm_guard's PromptInjection and
+Toxicity scanners to ONNX, applies dynamic int8 quantization, and serves
+them from a CPU InferenceSession. Quantized weights are ~4x smaller and
+roughly halve classifier latency on VNNI-capable CPUs. Exported models are
+cached on disk so the conversion only runs on first start.
+"""
+import collections
+import concurrent.futures
+import os
+import queue
+import shutil
+import threading
+import time
+
+import numpy as np
+import onnxruntime
+from onnxruntime.quantization import QuantType, quantize_dynamic
+from optimum.onnxruntime import ORTModelForSequenceClassification
+from transformers import AutoConfig, AutoTokenizer
+
+# Model IDs match the defaults llm_guard uses for the FP32 scanners
+PROMPT_INJECTION_MODEL = "ProtectAI/deberta-v3-base-prompt-injection-v2"
+TOXICITY_MODEL = "unitary/unbiased-toxic-roberta"
+
+# The labels llm_guard's Toxicity scanner actually thresholds on. The model
+# also emits identity-mention heads (male, muslim, black, ...) that fire on
+# benign mentions of those groups and must not count toward the risk score.
+TOXIC_LABELS = (
+    "toxicity",
+    "severe_toxicity",
+    "obscene",
+    "threat",
+    "insult",
+    "identity_attack",
+    "sexual_explicit",
+)
+
+ONNX_CACHE_DIR = os.environ.get(
+    "LLM_GUARD_ONNX_CACHE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "onnx_cache"),
+)
+
+MAX_LENGTH = 512
+
+# Micro-batching: concurrent scans arriving within MAX_WAIT_SECONDS are run
+# as one padded forward pass instead of N batch-1 passes
+MAX_BATCH = 16
+MAX_WAIT_SECONDS = 0.005
+
+# Recently tokenized texts kept per tokenizer family
+ENCODING_CACHE_SIZE = 128
+
+
+class _EncodingCache:
+    """Small LRU of token ids so repeated texts tokenize once per scanner
+
+    One cache per scanner: sharing encodings across scanners would require
+    proving real tokenizer identity (same vocab file, not just the same
+    class), and two fine-tunes that merely look alike would silently swap
+    wrong token ids. The models in use have different tokenizers anyway.
+    """
+
+    def __init__(self, tokenizer):
+        self._tokenizer = tokenizer
+        self._cache = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def encode(self, text):
+        """Return token ids for text, tokenizing only on cache miss"""
+        with self._lock:
+            ids = self._cache.get(text)
+            if ids is not None:
+                self._cache.move_to_end(text)
+                return ids
+
+        ids = self._tokenizer(text, truncation=True, max_length=MAX_LENGTH)["input_ids"]
+        with self._lock:
+            self._cache[text] = ids
+            if len(self._cache) > ENCODING_CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return ids
+
+
+class _MicroBatcher:
+    """Coalesces concurrent classify calls into one batched forward pass
+
+    Scanners run on a thread pool, so the batcher is thread-based: callers
+    enqueue their text and block on a future while a single worker drains up
+    to MAX_BATCH entries (waiting at most MAX_WAIT_SECONDS for stragglers)
+    and runs them through the session together.
+    """
+
+    def __init__(self, run_batch):
+        self._run_batch = run_batch
+        self._queue = queue.Queue()
+        self._worker = threading.Thread(target=self._loop, daemon=True)
+        self._worker.start()
+
+    def submit(self, text):
+        future = concurrent.futures.Future()
+        self._queue.put((text, future))
+        return future.result()
+
+    def _loop(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + MAX_WAIT_SECONDS
+            while len(batch) < MAX_BATCH:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            try:
+                scores = self._run_batch([text for text, _ in batch])
+            except Exception as exc:
+                for _, future in batch:
+                    future.set_exception(exc)
+                continue
+
+            for (_, future), score in zip(batch, scores):
+                future.set_result(score)
+
+
+def _quantized_model_path(model_id):
+    """Export model_id to ONNX and quantize to int8, caching the result
+
+    Safe under concurrent cold starts: every worker runs this from the
+    startup hook, so the export and quantization happen in a per-process
+    staging directory and the finished model is published atomically with
+    os.replace(). Workers never see a half-written file; at worst several
+    do the same export and the last replace wins with identical content.
+    """
+    model_dir = os.path.join(ONNX_CACHE_DIR, model_id.replace("/", "--"))
+    quantized_path = os.path.join(model_dir, "model.quant.onnx")
+    if not os.path.exists(quantized_path):
+        staging_dir = "%s.tmp.%d" % (model_dir, os.getpid())
+        try:
+            ort_model = ORTModelForSequenceClassification.from_pretrained(
+                model_id, export=True
+            )
+            ort_model.save_pretrained(staging_dir)
+            staging_quantized = os.path.join(staging_dir, "model.quant.onnx")
+            quantize_dynamic(
+                os.path.join(staging_dir, "model.onnx"),
+                staging_quantized,
+                weight_type=QuantType.QInt8,
+            )
+            os.makedirs(model_dir, exist_ok=True)
+            os.replace(staging_quantized, quantized_path)
+        finally:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+    return quantized_path
+
+
+class ORTClassifierScanner:
+    """Base scanner running an int8 sequence classifier via ONNX Runtime
+
+    Mirrors the llm_guard scanner API: scan(prompt) returns
+    (sanitized, is_valid, risk_score).
+    """
+
+    def __init__(self, model_id, threshold):
+        self._threshold = threshold
+        self._tokenizer = AutoTokenizer.from_pretrained(model_id)
+        sess_options = onnxruntime.SessionOptions()
+        sess_options.intra_op_num_threads = max(1, (os.cpu_count() or 1) // 2)
+        # Load by path: ORT reads the file itself, and the page cache keeps
+        # one physical copy of the read-only weight data per box no matter
+        # how many workers open it
+        self._session = onnxruntime.InferenceSession(
+            _quantized_model_path(model_id),
+            sess_options,
+            providers=["CPUExecutionProvider"],
+        )
+        self._input_names = {i.name for i in self._session.get_inputs()}
+        self._encodings = _EncodingCache(self._tokenizer)
+        self._batcher = _MicroBatcher(self._run_batch)
+
+    def _run_batch(self, texts):
+        ids = [self._encodings.encode(text) for text in texts]
+        max_len = max(len(seq) for seq in ids)
+        pad_id = self._tokenizer.pad_token_id or 0
+        input_ids = np.full((len(ids), max_len), pad_id, dtype=np.int64)
+        attention_mask = np.zeros((len(ids), max_len), dtype=np.int64)
+        for row, seq in enumerate(ids):
+            input_ids[row, :len(seq)] = seq
+            attention_mask[row, :len(seq)] = 1
+
+        inputs = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self._input_names:
+            inputs["token_type_ids"] = np.zeros_like(input_ids)
+        inputs = {k: v for k, v in inputs.items() if k in self._input_names}
+
+        logits = self._session.run(None, inputs)[0]
+        return [self._score_from_logits(row) for row in logits]
+
+    def _score_from_logits(self, logits):
+        raise NotImplementedError
+
+    def scan(self, prompt):
+        score = round(self._batcher.submit(prompt), 2)
+        return prompt, score < self._threshold, score
+
+
+class ORTPromptInjection(ORTClassifierScanner):
+    """int8 replacement for PromptInjection (binary SAFE/INJECTION softmax)"""
+
+    # Reported in threats_detected under the original scanner name
+    name = "PromptInjection"
+
+    def __init__(self, threshold=0.8):
+        super().__init__(PROMPT_INJECTION_MODEL, threshold)
+
+    def _score_from_logits(self, logits):
+        exp = np.exp(logits - logits.max())
+        return float((exp / exp.sum())[1])
+
+
+class ORTToxicity(ORTClassifierScanner):
+    """int8 replacement for Toxicity (multi-label sigmoid, worst toxic label wins)"""
+
+    # Reported in threats_detected under the original scanner name
+    name = "Toxicity"
+
+    def __init__(self, threshold=0.7):
+        super().__init__(TOXICITY_MODEL, threshold)
+        id2label = AutoConfig.from_pretrained(TOXICITY_MODEL).id2label
+        self._toxic_indices = [
+            i for i, label in sorted(id2label.items())
+            if label.lower() in TOXIC_LABELS
+        ]
+
+    def _score_from_logits(self, logits):
+        toxic = logits[self._toxic_indices]
+        return float((1.0 / (1.0 + np.exp(-toxic))).max())
@@ -1,7 +1,13 @@
 """LLM Guard Scanner Service - FastAPI HTTP endpoints"""
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.responses import ORJSONResponse
 from typing import List, Dict, Any, Optional
+import msgspec
+import numpy as np
+import asyncio
+import concurrent.futures
+import functools
+import os
 import uvicorn
 import logging
 import sys
@@ -19,6 +25,12 @@ logger = logging.getLogger(__name__)
 SERVICE_START_TIME = None
 SCAN_COUNT = {"input": 0, "output": 0}
 
+# /health payload served from this cache; a background task rebuilds it every
+# HEALTH_REFRESH_INTERVAL seconds so probe storms cost a dict lookup, not a
+# datetime format per request
+HEALTH_REFRESH_INTERVAL = 0.5
+_CACHED_HEALTH_BLOB = b"{}"
+
 def validate_and_create_scanners():
     """Validate configuration and create scanners with clear error messages"""
     logger.info("=" * 60)
@@ -55,26 +67,99 @@ def validate_and_create_scanners():
         logger.error("=" * 60)
         raise
 
-# Validate config and create scanners at import time
-# This ensures we fail fast with clear error messages
-from llm_guard import scan_prompt, scan_output
-input_scanners, output_scanners = validate_and_create_scanners()
+# Scanners are built in the startup hook, not at import: the uvicorn
+# supervisor imports this module too and must not load the model stack it
+# never serves requests with. Each worker builds its own copy post-fork and
+# still fails fast, with the same clear error messages, before serving.
+input_scanners = []
+output_scanners = []
+
+# Set LLM_GUARD_DEBUG=1 to re-enable the interactive docs and access log
+DEBUG = os.environ.get("LLM_GUARD_DEBUG", "").lower() in ("1", "true", "yes")
+
+# orjson serializes responses in C; matters when sanitized_content is long.
+# Docs/OpenAPI routes are off in production - this service only ever talks
+# to the local plugin
+app = FastAPI(
+    title="LLM Guard Scanner Service",
+    default_response_class=ORJSONResponse,
+    docs_url="/docs" if DEBUG else None,
+    redoc_url=None,
+    openapi_url="/openapi.json" if DEBUG else None,
+)
+
+# Scanners are independent per-request, so run them on a bounded thread pool
+# instead of sequentially on the event loop. Model scanners release the GIL
+# during inference, so wall-clock latency drops from the sum of all scanners
+# to roughly the slowest one. Sized in the startup hook once the scanner
+# count is known.
+EXEC = None
+
+async def run_scanners_concurrently(scanners, scan_args):
+    """Run independent scanners in the thread pool and merge their results"""
+    loop = asyncio.get_running_loop()
+    results = await asyncio.gather(*[
+        loop.run_in_executor(EXEC, functools.partial(scanner.scan, *scan_args))
+        for scanner in scanners
+    ])
+
+    content = scan_args[-1]
+    results_valid = {}
+    results_score = {}
+    redacting_scanners = []
+    for scanner, (sanitized, is_valid, score) in zip(scanners, results):
+        # Custom scanners carry a stable name matching the llm_guard scanner
+        # they replaced, so threats_detected keys stay the documented ones
+        name = getattr(scanner, "name", type(scanner).__name__)
+        results_valid[name] = is_valid
+        results_score[name] = score
+        if sanitized != content:
+            redacting_scanners.append(scanner)
+
+    # Every scanner saw the original content, so chain the (rare, cheap)
+    # scanners that redacted it sequentially to combine their redactions
+    sanitized = content
+    for scanner in redacting_scanners:
+        args = scan_args[:-1] + (sanitized,)
+        sanitized, _, _ = await loop.run_in_executor(
+            EXEC, functools.partial(scanner.scan, *args)
+        )
 
-class ScanInputRequest(BaseModel):
+    return sanitized, results_valid, results_score
+
+def summarize_results(results_valid, results_score):
+    """Collect failing scanner names and the overall (max) risk score
+
+    The score reduction goes through a numpy array so it stays a single
+    C-level max as the scanner list grows, instead of a Python-interpreter
+    comparison per scanner. float64 keeps the scanners' values exact - a
+    float32 round-trip would turn 0.99 into 0.9900000095... in the API.
+    """
+    threats = [name for name, is_valid in results_valid.items() if not is_valid]
+    if not results_score:
+        return threats, 0.0
+    scores = np.fromiter(
+        results_score.values(), dtype=np.float64, count=len(results_score)
+    )
+    return threats, float(scores.max())
+
+# Request/response models are msgspec Structs: validation and JSON
+# encode/decode happen in C instead of pydantic's per-field validators
+class ScanInputRequest(msgspec.Struct):
     content: str
     source: Optional[str] = None  # URL, file path, etc.
 
-class ScanOutputRequest(BaseModel):
+class ScanOutputRequest(msgspec.Struct):
     prompt: str
     output: str
 
-class ScanResult(BaseModel):
+class ScanResult(msgspec.Struct):
     sanitized_content: str
     is_valid: bool
     risk_score: float
     threats_detected: List[str]
 
-class HealthResponse(BaseModel):
+class HealthResponse(msgspec.Struct):
     status: str
     input_scanner_count: int
     output_scanner_count: int
@@ -82,95 +167,134 @@ class HealthResponse(BaseModel):
     uptime_seconds: Optional[float] = None
     scans_completed: Optional[Dict[str, int]] = None
 
-@app.on_event("startup")
-async def startup_event():
-    """Record service start time"""
-    global SERVICE_START_TIME
-    SERVICE_START_TIME = datetime.utcnow()
-    logger.info(f"Service ready at http://127.0.0.1:8765")
+def decode_request(raw, request_type):
+    """Decode and validate a JSON request body, mapping bad input to 422"""
+    try:
+        return msgspec.json.decode(raw, type=request_type)
+    except msgspec.DecodeError as e:
+        raise HTTPException(status_code=422, detail=str(e))
 
-@app.get("/health", response_model=HealthResponse)
-async def health_check():
-    """Health check endpoint with uptime and scan stats"""
+def json_response(result):
+    """Encode a msgspec Struct as a JSON response"""
+    return Response(msgspec.json.encode(result), media_type="application/json")
+
+def _rebuild_health_cache():
+    """Refresh the cached, pre-encoded /health payload"""
+    global _CACHED_HEALTH_BLOB
     uptime = None
     if SERVICE_START_TIME:
         uptime = (datetime.utcnow() - SERVICE_START_TIME).total_seconds()
 
-    return HealthResponse(
+    _CACHED_HEALTH_BLOB = msgspec.json.encode(HealthResponse(
         status="healthy",
         input_scanner_count=len(input_scanners),
         output_scanner_count=len(output_scanners),
         timestamp=datetime.utcnow().isoformat(),
         uptime_seconds=uptime,
-        scans_completed=SCAN_COUNT
+        scans_completed=SCAN_COUNT,
+    ))
+
+async def _refresh_health_cache():
+    """Keep the /health cache fresh without per-request work"""
+    while True:
+        _rebuild_health_cache()
+        await asyncio.sleep(HEALTH_REFRESH_INTERVAL)
+
+@app.on_event("startup")
+async def startup_event():
+    """Build the scanners and start the health cache refresher"""
+    global SERVICE_START_TIME, input_scanners, output_scanners, EXEC
+    input_scanners, output_scanners = validate_and_create_scanners()
+    EXEC = concurrent.futures.ThreadPoolExecutor(
+        max_workers=max(len(input_scanners), len(output_scanners))
     )
+    SERVICE_START_TIME = datetime.utcnow()
+    _rebuild_health_cache()
+    app.state.health_refresh_task = asyncio.create_task(_refresh_health_cache())
+    logger.info(f"Service ready at http://127.0.0.1:8765")
+
+@app.get("/health")
+async def health_check():
+    """Health check endpoint with uptime and scan stats (served from cache)"""
+    return Response(_CACHED_HEALTH_BLOB, media_type="application/json")
 
-@app.post("/scan/input", response_model=ScanResult)
-async def scan_input_content(request: ScanInputRequest):
+# The endpoints read the raw body off the Request and decode/encode with
+# msgspec directly, bypassing FastAPI's model machinery (a Body(bytes)
+# parameter would be JSON-parsed by FastAPI first and rejected); ScanResult
+# documents the shape
+@app.post("/scan/input", response_model=None)
+async def scan_input_content(request: Request):
     """Scan external content for prompt injection and sensitive data"""
+    payload = decode_request(await request.body(), ScanInputRequest)
     try:
         SCAN_COUNT["input"] += 1
-        sanitized, results_valid, results_score = scan_prompt(
-            input_scanners, request.content
+        sanitized, results_valid, results_score = await run_scanners_concurrently(
+            input_scanners, (payload.content,)
         )
 
-        # Determine threats detected
-        threats = [
-            scanner_name for scanner_name, is_valid 
-            in results_valid.items() if not is_valid
-        ]
-
-        # Calculate overall risk score (max of all scores)
-        risk_score = max(results_score.values()) if results_score else 0.0
+        # Determine threats and overall risk score (max of all scores)
+        threats, risk_score = summarize_results(results_valid, results_score)
 
         # Log security event if threats detected
         if threats:
             logger.warning(
                 f"Threats detected: {threats}, "
                 f"risk_score={risk_score}, "
-                f"source={request.source}"
+                f"source={payload.source}"
             )
 
-        return ScanResult(
+        return json_response(ScanResult(
             sanitized_content=sanitized,
             is_valid=len(threats) == 0,
             risk_score=risk_score,
             threats_detected=threats
-        )
+        ))
 
     except Exception as e:
         logger.error(f"Scan error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/scan/output", response_model=ScanResult)
-async def scan_output_content(request: ScanOutputRequest):
+@app.post("/scan/output", response_model=None)
+async def scan_output_content(request: Request):
     """Scan AI output for sensitive data leakage"""
+    payload = decode_request(await request.body(), ScanOutputRequest)
     try:
         SCAN_COUNT["output"] += 1
-        sanitized, results_valid, results_score = scan_output(
-            output_scanners, request.prompt, request.output
+        sanitized, results_valid, results_score = await run_scanners_concurrently(
+            output_scanners, (payload.prompt, payload.output)
         )
 
-        threats = [
-            scanner_name for scanner_name, is_valid 
-            in results_valid.items() if not is_valid
-        ]
-
-        risk_score = max(results_score.values()) if results_score else 0.0
+        threats, risk_score = summarize_results(results_valid, results_score)
 
         if threats:
             logger.warning(f"Output threats detected: {threats}, risk_score={risk_score}")
 
-        return ScanResult(
+        return json_response(ScanResult(
             sanitized_content=sanitized,
             is_valid=len(threats) == 0,
             risk_score=risk_score,
             threats_detected=threats
-        )
+        ))
 
     except Exception as e:
         logger.error(f"Output scan error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="127.0.0.1", port=8765)
+    # Passing the app as an import string lets uvicorn run multiple workers;
+    # each worker builds its own scanners in the startup hook, so model
+    # sessions and thread pools stay isolated per worker. Every worker costs
+    # ~1.5-2GB of model memory, so the default stays at 1 and scaling up is
+    # an explicit opt-in: set LLM_GUARD_WORKERS (cpu_count // 2 is a sane
+    # ceiling for the CPU-bound inference) and size the memory budget to
+    # match - the systemd unit's MemoryMax=3G assumes a single worker.
+    workers = int(os.environ.get("LLM_GUARD_WORKERS", "1"))
+    uvicorn.run(
+        "scanner_service:app",
+        host="127.0.0.1",
+        port=8765,
+        workers=workers,
+        loop="uvloop",
+        http="httptools",
+        access_log=DEBUG,
+    )